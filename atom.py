@@ -1,10 +1,12 @@
 import logging
+import contextlib
 import kessot_pb2
 
 class Atom:
+    special = {' ':'space'}
+
     def __init__(self, word):
         self.word = word
-        self.special = {' ':'space'}
 
     def isvariable(self):
         return self.word[0] == '$'
@@ -17,19 +19,55 @@ class Atom:
 class AtomManager:
     def __init__(self):
         self.atoms = {}
+        self.arenas = []
 
     def get(self, word):
-        if word not in self.atoms:
+        if word in self.atoms:
+            return self.atoms[word]
+        if len(self.arenas) == 0:
             self.atoms[word] = Atom(word)
             logging.info(f'Atom {word} registered')
-        return self.atoms[word]
+            return self.atoms[word]
+        for a in reversed(self.arenas):
+            if word in a:
+                return a[word]
+        self.arenas[-1][word] = Atom(word)
+        return self.arenas[-1][word]
 
-    def atomize(self, adict):
+    def atomize(self, adict, permanent=False):
         result = {}
         for k,v in adict.items():
             result[self.get(k)] = self.get(v)
+        if permanent:
+            for k,v in result.items():
+                self.promote(k)
+                self.promote(v)
         return result
 
+    def ispermanent(self, atom):
+        return atom != None and self.atoms.get(atom.word) is atom
+
+    def promote(self, atom):
+        if atom.word in self.atoms:
+            return
+        self.atoms[atom.word] = atom
+        for a in self.arenas:
+            a.pop(atom.word, None)
+        logging.info(f'Atom {atom.word} registered')
+
+    @contextlib.contextmanager
+    def arena(self, atoms=None):
+        self.arenas.append({} if atoms == None else atoms)
+        try:
+            yield
+        finally:
+            arena = self.arenas.pop(-1)
+            logging.debug(f'Arena with {len(arena)} atoms released')
+
+    def stats(self, context):
+        return { 'count':len(self.atoms), 'bytes':context.sizeof(self.atoms),
+                 'transient':sum(map(len, self.arenas)) }
+
     def save(self, context, patoms):
         for i, a in enumerate(self.atoms.values()):
             pa = kessot_pb2.Atom()
@@ -1,4 +1,5 @@
 import logging
+import tuples
 
 class BuiltinFunctions:
     def __init__(self, atoms):
@@ -17,4 +18,4 @@ class BuiltinFunctions:
 
     def concat(self, args, targets, solver):
         logging.debug(f'{solver.indent()}Concatenating {args} for {targets}')
-        return [{ self.keys['result'] : self.atoms.get(args[self.keys['dobj']].word + args[self.keys['iobj']].word) }]
\ No newline at end of file
+        return [ tuples.Binding({ self.keys['result'] : self.atoms.get(args[self.keys['dobj']].word + args[self.keys['iobj']].word) }) ]
\ No newline at end of file
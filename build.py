@@ -0,0 +1,128 @@
+import os
+import logging
+import hashlib
+import yaml
+import kessot_pb2
+import atom
+import tuples
+import rule
+import empty
+import parsing
+import bif
+import cache
+import stream
+import reasoning
+import interface
+
+Loader = getattr(yaml, 'CLoader', yaml.Loader)
+Dumper = getattr(yaml, 'CDumper', yaml.Dumper)
+
+def loadprompt(filename):
+    with open(filename) as fprompt:
+        return yaml.load(fprompt, Loader=Loader)
+
+def engine():
+    h = hashlib.sha256(f'format {stream.VERSION}'.encode())
+    for m in [ kessot_pb2, atom, tuples, rule, empty, parsing, bif, cache, stream, reasoning, interface ]:
+        with open(m.__file__, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def chain(state, section):
+    h = hashlib.sha256(state.encode())
+    h.update(yaml.dump(section, Dumper=Dumper, sort_keys=True).encode())
+    return h.hexdigest()
+
+def warm(body, prompt):
+    solver = reasoning.Solver(body)
+    for ymode in prompt:
+        mode, value = interface.select( {'maintenance':interface.Maintenance, 'test':interface.Test}, ymode)
+        if mode != interface.Test:
+            continue
+        for yfunc in value:
+            _, ytest = interface.select( {'resolve':None}, yfunc )
+            targets = [] if ytest['targets'] == None else list(ytest['targets'].keys())
+            solver.resolve_strings(ytest['args'], targets)
+    logging.info(f'Answer cache warmed with {len(body.cache.entries)} entries')
+
+class Step:
+    def __init__(self, state, value):
+        self.state = state
+        self.value = value
+
+class Builder:
+    def __init__(self, cachedir, cachesize=0):
+        self.cachedir = cachedir
+        self.cachesize = cachesize
+        self.steps = []
+        self.body = None
+        self.bodystep = None
+        self.passed = set()
+        self.failures = 0
+
+    def snapshot(self, state):
+        return os.path.join(self.cachedir, state + '.kess')
+
+    def ensure(self, index):
+        if self.bodystep == index:
+            return
+        start = None
+        if self.bodystep != None and self.bodystep < index:
+            start = self.bodystep
+        for i in range(index, -1, -1):
+            if start != None and i <= start:
+                break
+            if os.path.exists(self.snapshot(self.steps[i].state)):
+                logging.info(f'Reusing compiled body {self.steps[i].state}')
+                self.body = reasoning.Body.load(self.snapshot(self.steps[i].state))
+                start = i
+                break
+        if start == None:
+            self.body = reasoning.Body()
+        for i in range(-1 if start == None else start, index):
+            step = self.steps[i+1]
+            logging.info(f'Compiling maintenance section {step.state}')
+            interface.Maintenance(self.body).do(step.value)
+            self.body.save(self.snapshot(step.state))
+        self.bodystep = index
+
+    def build(self, prompt):
+        os.makedirs(self.cachedir, exist_ok=True)
+        passedfile = os.path.join(self.cachedir, 'passed')
+        if os.path.exists(passedfile):
+            with open(passedfile) as f:
+                self.passed = set(f.read().split())
+        state = engine()
+        passed = set()
+        for ymode in prompt:
+            mode, value = interface.select( {'maintenance':interface.Maintenance, 'test':interface.Test}, ymode)
+            if mode == interface.Maintenance:
+                state = chain(state, value)
+                self.steps.append( Step(state, value) )
+                continue
+            key = chain(state, value)
+            if key in self.passed:
+                logging.info(f'Test section {key} is unchanged, skipped')
+                passed.add(key)
+                continue
+            self.ensure(len(self.steps)-1)
+            test = interface.Test(self.body)
+            test.do(value)
+            self.failures += test.failures
+            if test.failures == 0:
+                passed.add(key)
+        self.ensure(len(self.steps)-1)
+        if self.cachesize > 0:
+            warm(self.body, prompt)
+            if len(self.steps) > 0:
+                self.body.save(self.snapshot(self.steps[-1].state), cachesize=self.cachesize)
+        self.prune()
+        with open(passedfile, 'w') as f:
+            f.write('\n'.join(sorted(passed)))
+        return self.body
+
+    def prune(self):
+        states = set(map(lambda x: x.state + '.kess', self.steps))
+        for name in os.listdir(self.cachedir):
+            if name.endswith('.kess') and name not in states:
+                os.remove(os.path.join(self.cachedir, name))
@@ -0,0 +1,133 @@
+import logging
+import hashlib
+import collections
+import kessot_pb2
+import tuples
+
+def digesttuple(h, tup):
+    for k, v in sorted(map(lambda x: (x[0].word, x[1].word), tup)):
+        h.update(k.encode())
+        h.update(b'\x00')
+        h.update(v.encode())
+        h.update(b'\x00')
+    h.update(b'\x01')
+
+def fingerprint(body):
+    h = hashlib.sha256()
+    h.update(b'facts')
+    for t in body.facts.tuples:
+        digesttuple(h, t)
+    h.update(b'rules')
+    for r in body.rules.rules:
+        digesttuple(h, r.definition)
+        for e in r.expressions:
+            digesttuple(h, e)
+        h.update(b'\x02')
+    h.update(b'empties')
+    for r in body.empty.rules:
+        digesttuple(h, r.definition)
+        digesttuple(h, r.query)
+    return h.digest()
+
+class CacheEntry:
+    def __init__(self, args, targets, results):
+        self.args = args
+        self.targets = targets
+        self.results = results
+        self.hits = 0
+
+    def __repr__(self):
+        return f'<CacheEntry {self.args} {self.targets} => {self.results} hits={self.hits}>'
+
+    def issaveable(self, context):
+        for a in [ *self.args.keys(), *self.args.values(), *self.targets ]:
+            if a not in context.atoms:
+                return False
+        for r in self.results:
+            for v in r.values():
+                if v not in context.atoms:
+                    return False
+        return True
+
+    def save(self, context):
+        pentry = kessot_pb2.CacheEntry()
+        tuples.Tuple.make(self.args).saveto(context, pentry.args)
+        for t in self.targets:
+            pentry.targets.append(context.atoms[t])
+        for r in self.results:
+            pentry.results.append( tuples.Tuple.make(r).save(context) )
+        pentry.hits = self.hits
+        return pentry
+
+    @classmethod
+    def load(cls, context, pentry):
+        args = dict(tuples.Tuple.load(context, pentry.args))
+        targets = list(map(lambda x: context.atoms[x], pentry.targets))
+        results = list(map(lambda x: tuples.Binding(tuples.Tuple.load(context, x)), pentry.results))
+        entry = cls(args, targets, results)
+        entry.hits = pentry.hits
+        return entry
+
+class AnswerCache:
+    def __init__(self, atoms, size=4096):
+        self.atoms = atoms
+        self.size = size
+        self.entries = collections.OrderedDict()
+
+    def key(self, args, targets):
+        return ( frozenset(args.items()), frozenset(targets) )
+
+    def lookup(self, args, targets):
+        key = self.key(args, targets)
+        entry = self.entries.get(key)
+        if entry == None:
+            return None
+        self.entries.move_to_end(key)
+        entry.hits += 1
+        return list(entry.results)
+
+    def ispermanent(self, args, targets, results):
+        for a in [ *args.keys(), *args.values(), *targets ]:
+            if not self.atoms.ispermanent(a):
+                return False
+        for r in results:
+            for v in r.values():
+                if not self.atoms.ispermanent(v):
+                    return False
+        return True
+
+    def store(self, args, targets, results):
+        if not self.ispermanent(args, targets, results):
+            return
+        entry = CacheEntry(dict(args), list(targets), list(results))
+        self.add(self.key(args, targets), entry)
+
+    def add(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries = collections.OrderedDict()
+
+    def stats(self, context):
+        return { 'count':len(self.entries), 'bytes':context.sizeof(self.entries),
+                 'hits':sum(map(lambda x: x.hits, self.entries.values())) }
+
+    def save(self, context, pcache, size):
+        pcache.version = fingerprint(context.body)
+        entries = filter(lambda x: x.issaveable(context), self.entries.values())
+        for e in sorted(entries, key=lambda x: x.hits, reverse=True)[:size]:
+            pcache.entries.append(e.save(context))
+
+    def load(self, context, pcache):
+        if len(pcache.entries) == 0:
+            return
+        if pcache.version != fingerprint(context.body):
+            logging.info(f'Stale answer cache with {len(pcache.entries)} entries dropped')
+            return
+        for pe in pcache.entries:
+            entry = CacheEntry.load(context, pe)
+            self.add(self.key(entry.args, entry.targets), entry)
+        logging.info(f'Answer cache with {len(self.entries)} entries loaded')
@@ -27,7 +27,7 @@ class EmptyRule:
         aquery = self.query.substitute(lvars)
         logging.debug(f'{solver.indent()}EmptyRule #{id(self):X}: query: {aquery}')
         if len(solver.resolve(aquery, [])) == 0:
-            result = [ {} ]
+            result = [ tuples.Binding() ]
         else:
             result = []
         logging.debug(f'{solver.indent()}EmptyRule #{id(self):X}: returns with {result}')
@@ -42,8 +42,8 @@ class EmptyRule:
     @classmethod
     def load(cls, context, prule):
         rule = cls()
-        rule.definition = Tuple.load(context, prule.definition)
-        rule.query = Tuple.load(context, prule.query)
+        rule.definition = tuples.Tuple.load(context, prule.definition)
+        rule.query = tuples.Tuple.load(context, prule.query)
         return rule
 
 class EmptyContainer:
@@ -65,6 +65,9 @@ class EmptyContainer:
                 break
         return results
 
+    def stats(self, context):
+        return { 'count':len(self.rules), 'bytes':context.sizeof(self.rules) }
+
     def save(self, context, prules):
         for r in self.rules:
             prules.append(r.save(context))
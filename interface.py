@@ -11,6 +11,7 @@ class Test:
     def __init__(self, body):
         self.body = body
         self.solver = reasoning.Solver(body)
+        self.failures = 0
 
     def do(self, prompt):
         logging.info('Entering test mode')
@@ -21,29 +22,36 @@ class Test:
 
     def resolve(self, ytest):
         logging.info(f'About to test resolve {ytest}')
+        for m in self.check(ytest):
+            self.failures += 1
+            print(m)
+        logging.info(f'Test {ytest} finished')
+
+    def check(self, ytest):
         if ytest['targets'] == None:
             targets = []
         else:
             targets = list(ytest['targets'].keys())
         results = self.solver.resolve_strings( ytest['args'], targets)
+        messages = []
         if ytest['targets'] == None:
             if len(results) > 0:
-                print(f'Bad number of results {len(results)} for None expected')
+                messages.append(f'Bad number of results {len(results)} for None expected')
         else:
             if len(results) != 1:
-                print(f'Bad number of results {len(results)} for 1 expected. Test: {ytest}')
+                messages.append(f'Bad number of results {len(results)} for 1 expected. Test: {ytest}')
             else:
                 results = results[0]
+                words = dict(map(lambda x: (x[0].word, x[1]), results.items()))
                 for k,v in ytest['targets'].items():
-                    ak = self.body.getatom(k)
-                    if ak not in results:
-                        print(f"key '{k}' is not found among results '{results}' in test {ytest}")
+                    if k not in words:
+                        messages.append(f"key '{k}' is not found among results '{results}' in test {ytest}")
                     else:
-                        if results[ak] != self.body.getatom(v):
-                            print(f"Different result for '{k}': {results[ak]} vs '{v}' in test {ytest}")
+                        if words[k] == None or words[k].word != v:
+                            messages.append(f"Different result for '{k}': {words[k]} vs '{v}' in test {ytest}")
                 if len(results) != len(ytest['targets']):
-                    print(f"Different number of results {len(results)} vs {len(ytest['targets'])} in test {ytest}")
-        logging.info(f'Test {ytest} finished')
+                    messages.append(f"Different number of results {len(results)} vs {len(ytest['targets'])} in test {ytest}")
+        return messages
 
 class Maintenance:
     def __init__(self, body):
@@ -1,16 +1,59 @@
 #!/usr/bin/python3
 
-import yaml
+import sys
+import argparse
 import logging
 import reasoning
 import interface
+import build
+import runner
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compiles a prompt file into a body file')
+    parser.add_argument('-i', '--incremental', action='store_true', help='reuse compiled sections and passed tests')
+    parser.add_argument('--cache', default='.kessbuild', help='directory for incremental build data')
+    parser.add_argument('--cache-size', type=int, default=0, help='number of warmed answers to store in the body file')
+    parser.add_argument('-t', '--test', action='store_true', help='run tests in parallel and check them against baselines')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of test worker processes')
+    parser.add_argument('--baseline', default='calc.baseline', help='file with per-test step baselines')
+    parser.add_argument('--latency-baseline', default='calc.latency', help='file with per-test latency baselines of this machine')
+    parser.add_argument('--update-baseline', action='store_true', help='store measured tests as the new baselines')
+    parser.add_argument('--latency-ratio', type=float, default=1.5, help='allowed latency growth over baseline')
+    parser.add_argument('--latency-min', type=float, default=0.005, help='tests faster than this many seconds skip the latency check')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per test, the fastest one is reported')
+    parser.add_argument('--steps-ratio', type=float, default=1.0, help='allowed resolution steps growth over baseline')
+    parser.add_argument('--json', default=None, help='write JSON test report')
+    parser.add_argument('--junit', default=None, help='write JUnit XML test report')
+    args = parser.parse_args()
     logging.basicConfig(level=logging.DEBUG, filename='make.log', filemode='w',
                         format='%(asctime)s %(name)s %(levelname)s %(message)s')
-    with open('calc.prompt') as fprompt:
-        yprompt = yaml.load(fprompt, Loader=yaml.Loader)
+    yprompt = build.loadprompt('calc.prompt')
+    if args.test:
+        testrunner = runner.Runner(args.jobs, args.latency_ratio, args.steps_ratio, args.latency_min, args.repeat)
+        body = testrunner.run(yprompt)
+        if not args.update_baseline:
+            testrunner.compare(runner.loadbaseline(args.baseline), runner.loadbaseline(args.latency_baseline))
+        if args.json != None:
+            testrunner.json(args.json)
+        if args.junit != None:
+            testrunner.junit(args.junit)
+        for c in testrunner.cases:
+            for m in c.messages + c.regressions:
+                print(f'{c.name()}: {m}')
+        if args.update_baseline:
+            runner.savebaseline(args.baseline, testrunner.baseline())
+            runner.savebaseline(args.latency_baseline, testrunner.latencies())
+        if testrunner.failed():
+            sys.exit(1)
+    elif args.incremental:
+        builder = build.Builder(args.cache, args.cache_size)
+        body = builder.build(yprompt)
+        if builder.failures > 0:
+            sys.exit(1)
+    else:
         body = reasoning.Body()
         interface = interface.Interface(body)
         interface.do(yprompt)
-        body.save('calc.kess')
\ No newline at end of file
+    if args.cache_size > 0 and not args.incremental:
+        build.warm(body, yprompt)
+    body.save('calc.kess', cachesize=args.cache_size)
@@ -1,4 +1,8 @@
+import re
+import bisect
 import logging
+import kessot_pb2
+import tuples
 
 class ParsingRule:
     def __init__(self):
@@ -32,9 +36,9 @@ class ParsingRule:
     @classmethod
     def make(cls, header, expressions):
         rule = cls()
-        rule.definition = Tuple.make(header)
+        rule.definition = tuples.Tuple.make(header)
         for e in expressions:
-            rule.expressions.append( Tuple.make(e) )
+            rule.expressions.append( tuples.Tuple.make(e) )
         return rule
 
     def save(self, context):
@@ -47,39 +51,69 @@ class ParsingRule:
     @classmethod
     def load(cls, context, prule):
         rule = cls()
-        rule.definition = Tuple.load(context, prule.definition)
+        rule.definition = tuples.Tuple.load(context, prule.definition)
         for e in prule.expressions:
-            rule.expressions.append( Tuple.load(context, e) )
+            rule.expressions.append( tuples.Tuple.load(context, e) )
         return rule
 
 class ParsingContainer:
     def __init__(self):
         self.rules = []
+        self.index = {}
 
     def append(self, header, expressions):
         rule = ParsingRule.make(header, expressions)
-        self.rules.append(rule)
+        self.add(rule)
         logging.info(f'{rule} appended')
         return rule
 
+    def add(self, rule):
+        keys = frozenset(map(lambda x: x[0], rule.definition))
+        self.index.setdefault(keys, ([], []))
+        positions, rules = self.index[keys]
+        positions.append(len(self.rules))
+        rules.append(rule)
+        self.rules.append(rule)
+
+    def candidate(self, context, start):
+        keys = frozenset(context.current[-1].keys())
+        if keys not in self.index:
+            return None
+        positions, rules = self.index[keys]
+        for i in range(bisect.bisect_left(positions, start), len(positions)):
+            if rules[i].match(context):
+                return positions[i], rules[i]
+        return None
+
     def parse(self, context):
         logging.info(f'Parsing starts with {context}')
-        todo = True
-        while todo:
-            todo = False
-            for r in self.rules:
-                if r.match(context):
-                    r.apply(context)
-                    todo = True
+        position = 0
+        todo = False
+        while True:
+            found = self.candidate(context, position)
+            if found == None:
+                if not todo:
+                    break
+                position = 0
+                todo = False
+                continue
+            position, rule = found
+            rule.apply(context)
+            position += 1
+            todo = True
         logging.info(f'Parsing ends with {context}')
 
+    def stats(self, context):
+        return { 'count':len(self.rules), 'bytes':context.sizeof(self.rules),
+                 'index':{ 'count':len(self.index), 'bytes':context.sizeof(self.index) } }
+
     def save(self, context, prules):
         for r in self.rules:
             prules.append(r.save(context))
 
     def load(self, context, prules):
         for pr in prules:
-            self.rules.append(ParsingRule.load(context, pr))
+            self.add(ParsingRule.load(context, pr))
 
 class ParsingContext:
     def __init__(self):
@@ -96,3 +130,22 @@ class ParsingContext:
             return self.current[-1][key]
         return None
 
+class Tokenizer:
+    def __init__(self, classes=None):
+        if classes == None:
+            classes = [ ('number', r'[0-9]+'), ('word', r'[^\W\d_]+') ]
+        self.classes = classes
+        groups = map(lambda x: f'(?P<{x[0]}>{x[1]})', classes)
+        self.pattern = re.compile('|'.join([*groups, '(?P<char>.)']), re.DOTALL)
+
+    def split(self, text):
+        return list(map(lambda x: x.group(), self.pattern.finditer(text)))
+
+    def atomize(self, atoms, text):
+        known = {}
+        result = []
+        for t in self.split(text):
+            if t not in known:
+                known[t] = atoms.get(t)
+            result.append(known[t])
+        return result
@@ -1,3 +1,4 @@
+import sys
 import logging
 import kessot_pb2
 import atom
@@ -6,6 +7,8 @@ import rule
 import empty
 import parsing
 import bif
+import cache
+import stream
 
 class BodySaver:
     def __init__(self, body):
@@ -17,6 +20,29 @@ class BodyLoader:
         self.body = body
         self.atoms = {}
 
+class BodyStats:
+    def __init__(self, body):
+        self.body = body
+        self.seen = set()
+
+    def sizeof(self, obj):
+        size = 0
+        todo = [ obj ]
+        while len(todo) > 0:
+            o = todo.pop(-1)
+            if id(o) in self.seen:
+                continue
+            self.seen.add(id(o))
+            size += sys.getsizeof(o)
+            if isinstance(o, dict):
+                todo.extend(o.keys())
+                todo.extend(o.values())
+            elif isinstance(o, (list, tuple, set, frozenset)):
+                todo.extend(o)
+            elif hasattr(o, '__dict__'):
+                todo.append(o.__dict__)
+        return size
+
 class Body:
     def __init__(self):
         self.atoms = atom.AtomManager()
@@ -25,18 +51,22 @@ class Body:
         self.empty = empty.EmptyContainer()
         self.bif = bif.BuiltinFunctions(self.atoms)
         self.parsing = parsing.ParsingContainer()
+        self.cache = cache.AnswerCache(self.atoms)
 
     def addfact(self, args):
-        self.facts.append(self.atoms.atomize(args))
+        self.cache.clear()
+        self.facts.append(self.atoms.atomize(args, permanent=True))
 
     def addrule(self, header, expressions):
-        self.rules.append(self.atoms.atomize(header), list(map(lambda x: self.atoms.atomize(x), expressions)) )
+        self.cache.clear()
+        self.rules.append(self.atoms.atomize(header, permanent=True), list(map(lambda x: self.atoms.atomize(x, permanent=True), expressions)) )
 
     def addparsing(self, header, expressions):
-        self.parsing.append(self.atoms.atomize(header), list(map(lambda x: self.atoms.atomize(x), expressions)) )
+        self.parsing.append(self.atoms.atomize(header, permanent=True), list(map(lambda x: self.atoms.atomize(x, permanent=True), expressions)) )
 
     def addempty(self, header, query):
-        self.empty.append(self.atoms.atomize(header), self.atoms.atomize(query) )
+        self.cache.clear()
+        self.empty.append(self.atoms.atomize(header, permanent=True), self.atoms.atomize(query, permanent=True) )
 
     def parse(self, context):
         self.parsing.parse(context)
@@ -44,21 +74,52 @@ class Body:
     def getatom(self, astr):
         return self.atoms.get(astr)
 
-    def save(self, filename):
+    def stats(self, solver=None):
+        context = BodyStats(self)
+        result = { 'atoms':self.atoms.stats(context),
+                   'facts':self.facts.stats(context, self.atoms.atoms.get('action')),
+                   'rules':self.rules.stats(context),
+                   'empty':self.empty.stats(context),
+                   'parsing':self.parsing.stats(context),
+                   'cache':self.cache.stats(context) }
+        if solver != None:
+            result['solver'] = solver.stats(context)
+        return result
+
+    def save(self, filename, cachesize=0):
         context = BodySaver(self)
-        pbody = kessot_pb2.Body()
-        self.atoms.save(context, pbody.atoms)
-        self.facts.save(context, pbody.facts)
-        self.rules.save(context, pbody.rules)
-        self.empty.save(context, pbody.empties)
-        self.parsing.save(context, pbody.parsing)
+        header = kessot_pb2.Header()
+        header.version = stream.VERSION
+        header.atoms = len(self.atoms.atoms)
+        header.facts = (len(self.facts.tuples) + stream.CHUNK - 1) // stream.CHUNK
+        header.rules = len(self.rules.rules)
+        header.parsing = len(self.parsing.rules)
+        header.empties = len(self.empty.rules)
         with open(filename, 'wb') as f:
-            f.write(pbody.SerializeToString())
+            f.write(stream.MAGIC)
+            writer = stream.RecordWriter(f)
+            writer.append(header)
+            self.atoms.save(context, writer)
+            for i in range(0, len(self.facts.tuples), stream.CHUNK):
+                pchunk = kessot_pb2.FactChunk()
+                for t in self.facts.tuples[i:i+stream.CHUNK]:
+                    pchunk.facts.append(t.save(context))
+                writer.append(pchunk)
+            self.rules.save(context, writer)
+            self.parsing.save(context, writer)
+            self.empty.save(context, writer)
+            if cachesize > 0:
+                pcache = kessot_pb2.Cache()
+                self.cache.save(context, pcache, cachesize)
+                writer.append(pcache)
 
     @classmethod
-    def load(cls, filename):
-        pbody = kessot_pb2.Body()
+    def load(cls, filename, jobs=None):
         with open(filename, 'rb') as f:
+            if f.read(len(stream.MAGIC)) == stream.MAGIC:
+                return cls.loadstream(stream.RecordReader(f), jobs)
+            f.seek(0)
+            pbody = kessot_pb2.Body()
             pbody.ParseFromString(f.read())
         body = cls()
         context = BodyLoader(body)
@@ -67,6 +128,27 @@ class Body:
         body.rules.load(context, pbody.rules)
         body.empty.load(context, pbody.empties)
         body.parsing.load(context, pbody.parsing)
+        body.cache.load(context, pbody.cache)
+        return body
+
+    @classmethod
+    def loadstream(cls, reader, jobs=None):
+        header = kessot_pb2.Header()
+        header.ParseFromString(reader.read())
+        if header.version != stream.VERSION:
+            raise Exception(f'Unsupported body file version {header.version}')
+        body = cls()
+        context = BodyLoader(body)
+        body.atoms.load(context, reader.records(kessot_pb2.Atom, header.atoms))
+        body.facts.loadchunks(context, reader.facts(header.facts, jobs))
+        body.rules.load(context, reader.records(kessot_pb2.Rule, header.rules))
+        body.parsing.load(context, reader.records(kessot_pb2.Rule, header.parsing))
+        body.empty.load(context, reader.records(kessot_pb2.Empty, header.empties))
+        data = reader.read(optional=True)
+        if data != None:
+            pcache = kessot_pb2.Cache()
+            pcache.ParseFromString(data)
+            body.cache.load(context, pcache)
         return body
 
 class Query:
@@ -88,13 +170,28 @@ class Solver:
     def __init__(self, body):
         self.body = body
         self.queries = []
+        self.steps = 0
+        self.cycles = 0
+        self.memo = None
 
     def resolve(self, args, targets):
         logging.info(f' {self.indent()}Resolving {args} {targets}')
-        if self.checkcycle(args, targets):
+        self.steps += 1
+        toplevel = len(self.queries) == 0
+        cached = self.body.cache.lookup(args, targets) if toplevel else None
+        key = self.body.cache.key(args, targets) if self.memo != None else None
+        if cached != None:
+            logging.info(f' {self.indent()}Answer found in cache')
+            results = cached
+        elif self.memo != None and key in self.memo:
+            logging.info(f' {self.indent()}Answer shared within batch')
+            results = self.memo[key]
+        elif self.checkcycle(args, targets):
             logging.info(' {self.indent()}Cycle detected')
+            self.cycles += 1
             results = []
         else:
+            cycles = self.cycles
             results = self.body.facts.resolve(args, targets)
             if len(results) == 0:
                 results = self.body.rules.resolve(args, targets, self)
@@ -103,6 +200,10 @@ class Solver:
             if len(results) == 0:
                 results = self.body.bif.resolve(args, targets, self)
             self.queries.pop(-1)
+            if self.memo != None and self.cycles == cycles:
+                self.memo[key] = results
+            if toplevel:
+                self.body.cache.store(args, targets, results)
         logging.info(f' {self.indent()}Concept resolved with with {results}')
         return results
 
@@ -114,32 +215,69 @@ class Solver:
         return False
 
     def resolve_strings(self, args, results):
-        return self.resolve(self.body.atoms.atomize(args), list(map(lambda x: self.body.atoms.get(x), results)) )
+        with self.body.atoms.arena():
+            return self.resolve(self.body.atoms.atomize(args), list(map(lambda x: self.body.atoms.get(x), results)) )
+
+    def resolve_many(self, queries):
+        logging.info(f'Resolving batch of {len(queries)} queries')
+        results = [ None ] * len(queries)
+        with self.body.atoms.arena():
+            batch = list(map(lambda x: (self.body.atoms.atomize(x[0]), list(map(lambda t: self.body.atoms.get(t), x[1]))), queries))
+            groups = {}
+            for i, (args, targets) in enumerate(batch):
+                groups.setdefault( (frozenset(args.keys()), frozenset(targets)), [] ).append(i)
+            indexes = {}
+            self.memo = {}
+            try:
+                for (roles, _), indices in groups.items():
+                    if roles not in indexes:
+                        indexes[roles] = self.body.facts.index(roles)
+                    for i in indices:
+                        args, targets = batch[i]
+                        results[i] = indexes[roles].resolve(args, targets)
+                        if len(results[i]) == 0:
+                            results[i] = self.resolve(args, targets)
+            finally:
+                self.memo = None
+        logging.info(f'Batch of {len(queries)} queries resolved')
+        return results
+
+    def stats(self, context):
+        return { 'count':len(self.queries), 'bytes':context.sizeof(self.queries), 'steps':self.steps }
 
     def indent(self):
         return '  ' * len(self.queries)
 
 class Talker:
-    def __init__(self, body):
+    def __init__(self, body, tokenizer=None):
         self.body = body
         self.next = self.body.getatom('next')
         self.reaction = self.body.getatom('reaction')
-        self.context = ParsingContext()
+        self.context = parsing.ParsingContext()
+        self.solver = Solver(body)
+        self.tokenizer = parsing.Tokenizer() if tokenizer == None else tokenizer
+        self.arena = {}
         self.reactions = { self.body.getatom('resolve') : self.resolve }
 
     def put(self, prompt):
         logging.info(f'Prompt "{prompt}" provided, context={self.context}')
+        with self.body.atoms.arena(self.arena):
+            result = self.putatoms(self.tokenizer.atomize(self.body.atoms, prompt))
+        if self.context.current == [ {} ]:
+            self.arena = {}
+        logging.info(f'Prompt "{prompt}" done, context={self.context}')
+        return ''.join( map(lambda x: x.word, result))
+
+    def putatoms(self, atoms):
+        logging.info(f'Processing {len(atoms)} tokens')
         result = []
-        for c in prompt:
-            ac = self.body.getatom(c)
-            logging.info(f'Processing {ac}, context={self.context}')
-            self.context.put(self.next, ac)
+        for a in atoms:
+            self.context.put(self.next, a)
             self.body.parse(self.context)
             reaction = self.context.get(self.reaction)
             if reaction != None:
                 result.extend( self.reactions[reaction]() )
-        logging.info(f'Prompt "{prompt}" done, context={self.context}')
-        return ''.join( map(lambda x: x.word, result))
+        return result
 
     def resolve(self):
         logging.debug(f'Resolving starts with {self.context}')
@@ -147,15 +285,15 @@ class Talker:
         current.pop(self.reaction)
         self.context.current.append({})
         question = current.pop(self.body.getatom('question'))
-        result = self.body.resolve(current, [ question ] )
+        result = self.solver.resolve(current, [ question ] )
         logging.debug(f'Resolving ends with {self.context}')
         if len(result) > 0:
             if question in result[0]:
                 return [ result[0][question] ]
         return []
 
-def load(filename):
-    return Body.load(filename)
+def load(filename, jobs=None):
+    return Body.load(filename, jobs)
 
-def maketalker(filename):
-    return Talker(load(filename))
+def maketalker(filename, jobs=None):
+    return Talker(load(filename, jobs))
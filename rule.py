@@ -18,6 +18,12 @@ class RuleExpressionSolver:
     def __contains__(self, key):
         return key in self.lvars
 
+    def __eq__(self, other):
+        return isinstance(other, RuleExpressionSolver) and self.lvars == other.lvars
+
+    def __hash__(self):
+        return hash(frozenset(self.lvars.items()))
+
     def solve(self, expression, body):
         logging.debug(f'{body.indent()}RES #{id(self):X}: local vars {self.lvars} expression {expression}')
         args = {}
@@ -60,7 +66,7 @@ class RuleSolver:
                 logging.debug(f'{self.body.indent()}RuleSolver #{id(self):X}: intermediate results {results}')
                 for r in results:
                     nextctx.append( RuleExpressionSolver(r) )
-            current = nextctx
+            current = tuples.unique(nextctx)
         logging.debug(f'{self.body.indent()}RuleSolver #{id(self):X}: finished with {current}')
         return current
 
@@ -99,8 +105,8 @@ class Rule:
             resvar = {}
             for t in targets:
                 resvar[t] = r[self.definition[t]]
-            results.append(resvar)
-        return results
+            results.append(tuples.Binding(resvar))
+        return tuples.unique(results)
 
     def save(self, context):
         prule = kessot_pb2.Rule()
@@ -112,9 +118,9 @@ class Rule:
     @classmethod
     def load(cls, context, prule):
         rule = cls()
-        rule.definition = Tuple.load(context, prule.definition)
+        rule.definition = tuples.Tuple.load(context, prule.definition)
         for e in prule.expressions:
-            rule.expressions.append( Tuple.load(context, e) )
+            rule.expressions.append( tuples.Tuple.load(context, e) )
         rule.makevars()
         return rule
 
@@ -135,7 +141,10 @@ class RuleContainer:
                 results.extend( r.apply(args, targets, body) )
             if len(results) > 0:
                 break
-        return results
+        return tuples.unique(results)
+
+    def stats(self, context):
+        return { 'count':len(self.rules), 'bytes':context.sizeof(self.rules) }
 
     def save(self, context, prules):
         for r in self.rules:
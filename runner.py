@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import logging
+import tempfile
+import yaml
+import itertools
+import concurrent.futures
+import xml.etree.ElementTree as ET
+import reasoning
+import interface
+import build
+
+worker = None
+
+def initworker(filename):
+    global worker
+    logging.disable(logging.INFO)
+    worker = reasoning.Body.load(filename)
+
+def runtest(ytest, repeat):
+    latencies = []
+    for i in range(repeat):
+        worker.cache.clear()
+        test = interface.Test(worker)
+        start = time.perf_counter()
+        messages = test.check(ytest)
+        latencies.append(time.perf_counter() - start)
+    return messages, min(latencies), test.solver.steps
+
+class Case:
+    def __init__(self, key, section, ytest):
+        self.key = key
+        self.section = section
+        self.ytest = ytest
+        self.messages = []
+        self.latency = None
+        self.steps = None
+        self.regressions = []
+
+    def name(self):
+        return f"{self.ytest['args']} => {self.ytest['targets']}"
+
+    def failed(self):
+        return len(self.messages) > 0 or len(self.regressions) > 0
+
+    def compare(self, steps, latencies, latencyratio, latencymin, stepsratio):
+        if self.key not in steps:
+            self.regressions.append(f"No steps baseline, run with --update-baseline")
+        elif self.steps > steps[self.key] * stepsratio:
+            self.regressions.append(f"Steps {self.steps} exceed baseline {steps[self.key]} by more than {stepsratio}x")
+        if self.key not in latencies or self.latency < latencymin:
+            return
+        if self.latency > latencies[self.key] * latencyratio:
+            self.regressions.append(f"Latency {self.latency:.6f}s exceeds baseline {latencies[self.key]:.6f}s by more than {latencyratio}x")
+
+    def report(self):
+        return { 'key':self.key, 'section':self.section, 'name':self.name(), 'latency':self.latency, 'steps':self.steps,
+                 'failures':self.messages, 'regressions':self.regressions }
+
+class Runner:
+    def __init__(self, jobs=None, latencyratio=1.5, stepsratio=1.0, latencymin=0.005, repeat=5):
+        self.jobs = jobs
+        self.latencyratio = latencyratio
+        self.stepsratio = stepsratio
+        self.latencymin = latencymin
+        self.repeat = repeat
+        self.cases = []
+
+    def run(self, prompt):
+        body = reasoning.Body()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i, ymode in enumerate(prompt):
+                mode, value = interface.select( {'maintenance':interface.Maintenance, 'test':interface.Test}, ymode)
+                if mode == interface.Maintenance:
+                    mode(body).do(value)
+                    continue
+                cases = []
+                for yfunc in value:
+                    _, ytest = interface.select( {'resolve':None}, yfunc )
+                    key = f"section{i} {yaml.dump(ytest, Dumper=build.Dumper, sort_keys=True, default_flow_style=True).strip()}"
+                    cases.append( Case(key, i, ytest) )
+                filename = os.path.join(tmpdir, f'{i}.kess')
+                body.save(filename)
+                self.runsection(filename, cases)
+                self.cases.extend(cases)
+        return body
+
+    def runsection(self, filename, cases):
+        logging.info(f'Running {len(cases)} tests against {filename}')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs, initializer=initworker, initargs=(filename,)) as pool:
+            results = pool.map(runtest, map(lambda x: x.ytest, cases), itertools.repeat(self.repeat))
+            for c, (messages, latency, steps) in zip(cases, results):
+                c.messages = messages
+                c.latency = latency
+                c.steps = steps
+                logging.info(f'Test {c.name()} took {latency:.6f}s and {steps} steps')
+
+    def compare(self, steps, latencies):
+        for c in self.cases:
+            c.compare(steps, latencies, self.latencyratio, self.latencymin, self.stepsratio)
+
+    def failed(self):
+        return any(map(lambda x: x.failed(), self.cases))
+
+    def baseline(self):
+        return dict(map(lambda x: (x.key, x.steps), self.cases))
+
+    def latencies(self):
+        return dict(map(lambda x: (x.key, x.latency), self.cases))
+
+    def json(self, filename):
+        with open(filename, 'w') as f:
+            json.dump( { 'tests':list(map(lambda x: x.report(), self.cases)) }, f, indent=1)
+
+    def junit(self, filename):
+        suite = ET.Element('testsuite', name='kessot', tests=str(len(self.cases)),
+                           failures=str(sum(map(lambda x: 1 if x.failed() else 0, self.cases))),
+                           time=f'{sum(map(lambda x: x.latency, self.cases)):.6f}')
+        for c in self.cases:
+            case = ET.SubElement(suite, 'testcase', classname=f'section{c.section}', name=c.name(), time=f'{c.latency:.6f}')
+            ET.SubElement(case, 'properties').append( ET.Element('property', name='steps', value=str(c.steps)) )
+            for m in c.messages:
+                ET.SubElement(case, 'failure', message=m, type='result')
+            for m in c.regressions:
+                ET.SubElement(case, 'failure', message=m, type='regression')
+        ET.ElementTree(suite).write(filename, encoding='utf-8', xml_declaration=True)
+
+def loadbaseline(filename):
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+def savebaseline(filename, baseline):
+    with open(filename, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
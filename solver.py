@@ -7,6 +7,7 @@ if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG, filename='solver.log', filemode='w',
                         format='%(asctime)s %(name)s %(levelname)s %(message)s')
     body = reasoning.load('calc.kess')
-    print(body.resolve_strings({'action':'+', 'dobj':'1', 'iobj':'2'}, ['result']))
-    print(body.resolve_strings({'action':'+', 'iobj':'3', 'result':'4'}, ['dobj']))
-    print(body.resolve_strings({'action':'+', 'dobj':'2', 'iobj':'3'}, ['result']))
+    solver = reasoning.Solver(body)
+    print(solver.resolve_strings({'action':'+', 'dobj':'1', 'iobj':'2'}, ['result']))
+    print(solver.resolve_strings({'action':'+', 'iobj':'3', 'result':'4'}, ['dobj']))
+    print(solver.resolve_strings({'action':'+', 'dobj':'2', 'iobj':'3'}, ['result']))
@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+
+import json
+import argparse
+import reasoning
+
+def dump(name, value, indent=''):
+    if 'bytes' in value:
+        print(f"{indent}{name:<{30-len(indent)}} {value['count']:>10} {value['bytes']:>14}")
+    for k,v in value.items():
+        if isinstance(v, dict):
+            dump(str(k), v, indent + '  ')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Reports counts and approximate memory usage of a body file')
+    parser.add_argument('filename', nargs='?', default='calc.kess', help='body file')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of processes decoding fact chunks')
+    parser.add_argument('--json', action='store_true', help='dump statistics as JSON')
+    args = parser.parse_args()
+    body = reasoning.load(args.filename, args.jobs)
+    stats = body.stats()
+    if args.json:
+        print(json.dumps(stats, indent=1))
+    else:
+        print(f"{'component':<30} {'count':>10} {'bytes':>14}")
+        for k,v in stats.items():
+            dump(k, v)
@@ -0,0 +1,79 @@
+import array
+import collections
+import concurrent.futures
+import kessot_pb2
+
+MAGIC = b'KESS'
+VERSION = 1
+CHUNK = 4096
+
+def encodevarint(value):
+    result = bytearray()
+    while value > 0x7f:
+        result.append((value & 0x7f) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+def decodefacts(data):
+    pchunk = kessot_pb2.FactChunk()
+    pchunk.ParseFromString(data)
+    lengths = array.array('I')
+    ids = array.array('I')
+    for pt in pchunk.facts:
+        lengths.append(len(pt.args))
+        for a in pt.args:
+            ids.append(a.role)
+            ids.append(a.value)
+    return lengths, ids
+
+class RecordWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def append(self, message):
+        data = message.SerializeToString()
+        self.f.write(encodevarint(len(data)))
+        self.f.write(data)
+
+class RecordReader:
+    def __init__(self, f):
+        self.f = f
+
+    def read(self, optional=False):
+        value = 0
+        shift = 0
+        while True:
+            b = self.f.read(1)
+            if len(b) == 0:
+                if optional and shift == 0:
+                    return None
+                raise Exception('Unexpected end of body file')
+            value |= (b[0] & 0x7f) << shift
+            if b[0] < 0x80:
+                break
+            shift += 7
+        data = self.f.read(value)
+        if len(data) != value:
+            raise Exception('Unexpected end of body file')
+        return data
+
+    def records(self, cls, count):
+        for i in range(count):
+            message = cls()
+            message.ParseFromString(self.read())
+            yield message
+
+    def facts(self, count, jobs=None):
+        if jobs == None or jobs < 2:
+            for i in range(count):
+                yield decodefacts(self.read())
+            return
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            pending = collections.deque()
+            for i in range(count):
+                pending.append(pool.submit(decodefacts, self.read()))
+                if len(pending) >= 2 * jobs:
+                    yield pending.popleft().result()
+            while len(pending) > 0:
+                yield pending.popleft().result()
@@ -1,6 +1,21 @@
 import logging
 import kessot_pb2
 
+class Binding(dict):
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return (Binding, (dict(self),))
+
+    def readonly(self, *args, **kwargs):
+        raise TypeError('Binding is immutable')
+
+    __setitem__ = __delitem__ = __ior__ = pop = popitem = clear = update = setdefault = readonly
+
+def unique(items):
+    return list(dict.fromkeys(items))
+
 class Tuple:
     def __init__(self):
         self.args = {}
@@ -14,6 +29,12 @@ class Tuple:
     def __contains__(self, key):
         return key in self.args
 
+    def __eq__(self, other):
+        return isinstance(other, Tuple) and self.args == other.args
+
+    def __hash__(self):
+        return hash(frozenset(self.args.items()))
+
     def match(self, args, strict=False):
         for k,v in args.items():
             if k not in self.args:
@@ -38,7 +59,7 @@ class Tuple:
                 result[t] = self.args[t]
             else:
                 result[t] = None
-        return result
+        return Binding(result)
 
     def substitute(self, lvars):
         result = {}
@@ -84,6 +105,28 @@ class Tuple:
            tup.args[context.atoms[parg.role]] = context.atoms[parg.value]
         return tup
 
+class TupleIndex:
+    def __init__(self, roles):
+        self.roles = roles
+        self.tuples = {}
+        self.wildcards = []
+
+    def add(self, tup):
+        values = tuple(map(lambda x: tup[x], self.roles))
+        if any(map(lambda x: x.isvariable(), values)):
+            self.wildcards.append(tup)
+        else:
+            self.tuples.setdefault(values, []).append(tup)
+
+    def resolve(self, args, targets):
+        results = []
+        for t in self.tuples.get(tuple(map(lambda x: args[x], self.roles)), []):
+            results.append( t.get(targets) )
+        for t in self.wildcards:
+            if t.match(args):
+                results.append( t.get(targets) )
+        return unique(results)
+
 class TupleContainer:
     def __init__(self):
         self.tuples = []
@@ -103,7 +146,24 @@ class TupleContainer:
         for t in self.tuples:
             if t.match(args):
                 results.append( t.get(targets) )
-        return results
+        return unique(results)
+
+    def index(self, roles):
+        index = TupleIndex(list(roles))
+        for t in self.tuples:
+            if all(map(lambda x: x in t, index.roles)):
+                index.add(t)
+        return index
+
+    def stats(self, context, key):
+        actions = {}
+        for t in self.tuples:
+            name = t[key].word if key != None and key in t else None
+            action = actions.setdefault(name, { 'count':0, 'bytes':0 })
+            action['count'] += 1
+            action['bytes'] += context.sizeof(t)
+        return { 'count':len(self.tuples), 'bytes':sum(map(lambda x: x['bytes'], actions.values())) + context.sizeof(self.tuples),
+                 'actions':actions }
 
     def save(self, context, ptuples):
         for t in self.tuples:
@@ -112,3 +172,14 @@ class TupleContainer:
     def load(self, context, ptuples):
         for pt in ptuples:
             self.tuples.append(Tuple.load(context, pt))
+
+    def loadchunks(self, context, chunks):
+        atoms = context.atoms
+        for lengths, ids in chunks:
+            i = 0
+            for n in lengths:
+                tup = Tuple()
+                for j in range(i, i + 2 * n, 2):
+                    tup.args[atoms[ids[j]]] = atoms[ids[j+1]]
+                self.tuples.append(tup)
+                i += 2 * n